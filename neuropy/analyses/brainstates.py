@@ -64,14 +64,16 @@ def emg_from_LFP(
         # changrp = np.concatenate(probe.get_connected_channels(groupby="probe"))
         probe_df = probe.to_dataframe()
         probe_df = probe_df[probe_df.connected == True]
-        probe_df_chans = list(probe_df["channel_id"].values)
+        probe_df_chans = probe_df["channel_id"].to_numpy()
         x, y = probe_df.x.values.astype("float"), probe_df.y.values.astype("float")
         # --- choosing pairs of channels spaced min_dist --------
         squared_diff = lambda arr: (arr[:, np.newaxis] - arr[np.newaxis, :]) ** 2
         distance = np.sqrt(squared_diff(x) + squared_diff(y))
 
         emg_chans = emg_chans[np.isin(emg_chans, probe_df_chans)]
-        chan_probe_indx = [probe_df_chans.index(chan) for chan in emg_chans]
+        # row of each channel in probe_df, first match like list.index but in one search
+        order = np.argsort(probe_df_chans, kind="stable")
+        chan_probe_indx = order[np.searchsorted(probe_df_chans, emg_chans, sorter=order)]
         emg_chans_distance = distance[np.ix_(chan_probe_indx, chan_probe_indx)]
         pairs_bool = emg_chans_distance > min_dist
     else:
@@ -273,12 +275,14 @@ def detect_brainstates_epochs(
 
     # ---- Refining states --------
     # removing REM which happens within long WAKE. If REM follows after 200s of WAKE, then change them to Quiet waking.
+    # wake labels are looked up once, the boolean mask is then updated along with states
+    n_indx_before = 200 // dt  # 200 seconds window
+    wk_bool = np.isin(states, ["AW", "QW", "NOISE"])
     for rem_indx in np.where(states == "REM")[0]:
-        n_indx_before = 200 // dt  # 200 seconds window
         start_indx = np.max([0, rem_indx - n_indx_before])
-        wk_bool = np.isin(states[start_indx:rem_indx], ["AW", "QW", "NOISE"])
-        if wk_bool.sum() >= n_indx_before:
+        if np.count_nonzero(wk_bool[start_indx:rem_indx]) >= n_indx_before:
             states[rem_indx] = "QW"
+            wk_bool[rem_indx] = True
 
     # --- TODO micro-arousals ---------
     # ma_bool = emg_bool & delta_bool
@@ -23,10 +23,9 @@ def _np_assemble_spike_arrays(neurons, sample_rate):
     spike_times = np.concatenate(neurons.spiketrains)
 
     # Get neuron clusters
-    spike_clusters = np.concatenate([
-        np.full(len(spiketrain), cluster_id)
-        for spiketrain, cluster_id in zip(neurons.spiketrains, neurons.neuron_ids)
-    ])
+    spike_clusters = np.repeat(
+        neurons.neuron_ids, [len(spiketrain) for spiketrain in neurons.spiketrains]
+    )
 
     # Sort spike times and neuron clusters
     sort_ind = np.argsort(spike_times)
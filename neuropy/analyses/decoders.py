@@ -210,6 +210,8 @@ class Decode1d:
         ===========================
         """
         tau = self.bin_size
+        # products of many rates underflow in single precision
+        ratemaps = np.asarray(ratemaps, dtype=np.float64)
         n_positions, n_time_bins = ratemaps.shape[1], spkcount.shape[1]
 
         prob = np.zeros((n_positions, n_time_bins))
@@ -4,7 +4,7 @@ from neuropy.utils import mathutil, signal_process
 from scipy import stats
 from scipy.ndimage import gaussian_filter1d
 import scipy.signal as sg
-from copy import deepcopy
+from copy import copy
 
 from neuropy.core import Signal, ProbeGroup, Epoch
 from neuropy.utils.signal_process import WaveletSg, filter_sig
@@ -670,8 +670,8 @@ class Ripple:
         sxx_mean = np.concatenate(sxx_mean, axis=2)
         sxx_mean = np.average(sxx_mean, axis=2, weights=wvlt_n)
 
-        # Make into Wavelet class
-        wvlt_mean = deepcopy(wvlt)
+        # Make into Wavelet class, traces are replaced so no need to deepcopy them
+        wvlt_mean = copy(wvlt)
         wvlt_mean.traces = sxx_mean
         wvlt_mean.t_start = -buffer_sec
 
@@ -6,18 +6,157 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from matplotlib.gridspec import GridSpec
-from scipy.ndimage import gaussian_filter, gaussian_filter1d
+from scipy.ndimage import gaussian_filter1d
 from tqdm import tqdm
+from joblib import Parallel, delayed
 from scipy.signal import find_peaks, peak_widths
-from copy import deepcopy
+from copy import copy
 import seaborn as sns
 
 from neuropy import core
 from neuropy.utils.signal_process import ThetaParams
 from neuropy import plotting
-from neuropy.utils.mathutil import contiguous_regions
+from neuropy.utils.mathutil import contiguous_regions, ids_to_indices
 from neuropy.externals.peak_prominence2d import getProminence
 
+try:
+    import fast_histogram
+except ImportError:
+    fast_histogram = None
+
+
+def _is_uniform(edges):
+    """Whether bin edges are equally spaced"""
+    return len(edges) > 1 and np.allclose(np.diff(edges), edges[1] - edges[0])
+
+
+@dataclass(frozen=True)
+class _BinGeometry:
+    """Equally spaced bins, kept as scalars so that the bin of a value is a single multiply"""
+
+    start: float
+    stop: float
+    n_bins: int
+    inv_width: float
+
+    @classmethod
+    def from_edges(cls, edges):
+        return cls(edges[0], edges[-1], len(edges) - 1, 1 / (edges[1] - edges[0]))
+
+    def bin_indices(self, x):
+        """Index of the bin each value of x falls in, -1 for values outside the bins or nan.
+        Values on the last edge go to the last bin, as in np.histogram.
+        """
+        x = np.asarray(x, dtype=float)
+        idx = np.floor((x - self.start) * self.inv_width)
+        idx[x == self.stop] = self.n_bins - 1
+        idx[~((idx >= 0) & (idx < self.n_bins))] = -1
+        return idx.astype(int)
+
+
+def _histogram1d(x, bins):
+    """Counts of x within bin edges, like np.histogram(x, bins)[0]. Equally spaced edges
+    skip numpy's searchsorted over the edges: fast_histogram is used if installed, otherwise
+    bin indices are computed directly and counted with np.bincount. In that case a value within
+    rounding error of an inner edge may be counted in the neighbouring bin.
+    """
+    # binned in double precision, same as the edges, so values on the first and last edge are kept
+    x = np.ascontiguousarray(x, dtype=float)
+    if not _is_uniform(bins):
+        return np.histogram(x, bins=bins)[0]
+    if fast_histogram is not None:
+        # fast_histogram excludes the last edge, nudge it so values on it are counted like numpy
+        return fast_histogram.histogram1d(
+            x, bins=len(bins) - 1, range=(bins[0], np.nextafter(bins[-1], np.inf))
+        )
+    idx = _BinGeometry.from_edges(bins).bin_indices(x)
+    return np.bincount(idx[idx >= 0], minlength=len(bins) - 1)
+
+
+def _histogram2d_func(xbins, ybins):
+    """Returns a function counting (x, y) within the bin edges, like
+    np.histogram2d(x, y, bins=(xbins, ybins))[0]. The backend is chosen once per grid, so cells
+    binned on the same grid don't repeat the checks. When both edges are equally spaced
+    fast_histogram is used if installed, otherwise bin indices are computed directly and counted
+    with np.bincount; a value within rounding error of an inner edge may then be counted in the
+    neighbouring bin. Other edges go through numpy.
+    """
+    uniform = _is_uniform(xbins) and _is_uniform(ybins)
+    if uniform and fast_histogram is not None:
+        # fast_histogram excludes the last edge, nudge it so values on it are counted like numpy
+        bins = (len(xbins) - 1, len(ybins) - 1)
+        range_ = (
+            (xbins[0], np.nextafter(xbins[-1], np.inf)),
+            (ybins[0], np.nextafter(ybins[-1], np.inf)),
+        )
+        hist_ = lambda x, y: fast_histogram.histogram2d(x, y, bins=bins, range=range_)
+    elif uniform:
+        xgeom, ygeom = _BinGeometry.from_edges(xbins), _BinGeometry.from_edges(ybins)
+        nx, ny = xgeom.n_bins, ygeom.n_bins
+
+        def hist_(x, y):
+            ix, iy = xgeom.bin_indices(x), ygeom.bin_indices(y)
+            valid = (ix >= 0) & (iy >= 0)
+            counts = np.bincount((ix * ny + iy)[valid], minlength=nx * ny)
+            return counts.reshape(nx, ny).astype(float)
+
+    else:
+        hist_ = lambda x, y: np.histogram2d(x, y, bins=(xbins, ybins))[0]
+
+    # binned in double precision, same as the edges, so values on the first and last edge are kept
+    return lambda x, y: hist_(
+        np.ascontiguousarray(x, dtype=float), np.ascontiguousarray(y, dtype=float)
+    )
+
+
+def _interp_uniform(tq, t0, srate, *fps):
+    """np.interp(tq, t, fp) for each fp, where t = t0 + np.arange(len(fp)) / srate. The sample
+    index of each time is computed directly instead of searched for, and shared by all fps.
+    Times outside t take the first or last value, same as np.interp.
+    """
+    s = (np.asarray(tq, dtype=float) - t0) * srate
+    idx = np.floor(s).astype(int).clip(0, len(fps[0]) - 2)
+    w = (s - idx).clip(0, 1)
+    return tuple(fp[idx] + w * (fp[idx + 1] - fp[idx]) for fp in fps)
+
+
+def _where_in_epochs(t, starts, stops):
+    """Indices of t inside each epoch [start, stop], concatenated in epoch order, same as
+    np.concatenate([np.where((t >= start) & (t <= stop))[0] for start, stop in zip(starts, stops)]).
+    For sorted, non-overlapping epochs the epoch of every t is found in one searchsorted
+    instead of one full pass over t per epoch.
+    """
+    if len(starts) > 0 and np.all(np.diff(starts) > 0) and np.all(starts[1:] > stops[:-1]):
+        k = np.searchsorted(starts, t, side="right") - 1
+        idx = np.flatnonzero((k >= 0) & (t <= stops[k.clip(min=0)]))
+        return idx[np.argsort(k[idx], kind="stable")]
+
+    return np.concatenate(
+        [np.where((t >= start) & (t <= stop))[0] for start, stop in zip(starts, stops)]
+    )
+
+
+def _tuning_curve_peaks(tuning_curve, step=0.1, centroid_num_to_center=1, verbose=False, **kwargs):
+    """Heights, prominences and centers of the peaks of one (1, n_bins) tuning curve, found with
+    peak_prominence2d.getProminence. Kept at module level so that worker processes only receive
+    the tuning curve."""
+    peaks, idmap, promap, parentmap = getProminence(np.repeat(tuning_curve, 20, axis=0),
+                                                    step=step, centroid_num_to_center=centroid_num_to_center,
+                                                    verbose=verbose, **kwargs)
+
+    centers, heights, prominences = [], [], []
+    for ii, vv in peaks.items():
+        xii, yii = vv['center']
+        centers.append(xii)
+
+        z2ii = vv['height']
+        heights.append(z2ii)
+
+        pro = vv['prominence']
+        prominences.append(pro)
+
+    return np.array(heights), np.array(prominences), np.array(centers)
+
 
 class Pf1Dsplit():
     """Class used to split up Pf1D object by blocks to assess reliability"""
@@ -31,6 +170,9 @@ class Pf1Dsplit():
             grid_bin=5,
             sigma=1,
             t_interval_split=60,
+            sigma_pos=0.1,
+            n_jobs=1,
+            map_dtype=np.float64,
     ):
         self.t_start = position.t_start
         self.t_stop = position.t_stop
@@ -39,18 +181,27 @@ class Pf1Dsplit():
         blocks1, blocks2 = self.get_split_session_blocks(t_interval=t_interval_split)
 
         # Merge speed_thresh and blocks1 (speed_thresh is ignored in Pf1D class if epochs is provided)
+        res = 1 / position.sampling_rate
         abv_thresh_epochs = core.Epoch.from_boolean_array(position.speed > speed_thresh, position.time)
-        blocks1 = blocks1.intersection(abv_thresh_epochs, res=1/position.sampling_rate)
-        blocks2 = blocks2.intersection(abv_thresh_epochs, res=1 / position.sampling_rate)
+        blocks1 = blocks1.intersection(abv_thresh_epochs, res=res)
+        blocks2 = blocks2.intersection(abv_thresh_epochs, res=res)
 
         # Last merge any other epochs provided
         if epochs is not None:
-            blocks1 = blocks1.intersection(epochs, res=1/position.sampling_rate)
-            blocks2 = blocks2.intersection(epochs, res=1/position.sampling_rate)
+            blocks1 = blocks1.intersection(epochs, res=res)
+            blocks2 = blocks2.intersection(epochs, res=res)
 
-        # Create Pf1D object for each block
-        self.pf1 = Pf1D(neurons, position, blocks1, frate_thresh, speed_thresh, grid_bin, sigma)
-        self.pf2 = Pf1D(neurons, position, blocks2, frate_thresh, speed_thresh, grid_bin, sigma)
+        # Create Pf1D object for each block, position is smoothed once and shared by both.
+        # The two blocks are independent and only read neurons and position, so with n_jobs=2
+        # they are computed in parallel threads
+        if sigma_pos > 0:
+            position = position.get_smoothed(sigma_pos)
+        self.pf1, self.pf2 = Parallel(n_jobs=n_jobs, require="sharedmem")(
+            delayed(Pf1D)(
+                neurons, position, blocks, frate_thresh, speed_thresh, grid_bin, sigma, sigma_pos=0, map_dtype=map_dtype
+            )
+            for blocks in (blocks1, blocks2)
+        )
 
     def get_split_session_blocks(self, t_interval):
         """Calculate within session correlations for placefields calculated in 'time_interval_sec' blocks.
@@ -93,6 +244,7 @@ class Pf1D(core.Ratemap):
         grid_bin=5,
         sigma=0,
         sigma_pos=0.1,
+        map_dtype=np.float64,
     ):
         """computes 1d place field using linearized coordinates. It always computes two place maps with and
         without speed thresholds.
@@ -119,6 +271,8 @@ class Pf1D(core.Ratemap):
             occupancy.
             Recommended for high sample rates to remove artificially high speeds due to division by a very small
             denominator (1 / sample_rate).
+        map_dtype: numpy dtype
+            precision of occupancy and tuning curves, np.float32 halves their memory, by default np.float64
         NOTE: speed_thresh is ignored if epochs is provided
         """
 
@@ -134,65 +288,76 @@ class Pf1D(core.Ratemap):
         t_stop = position.t_stop
 
         smooth_ = lambda f: gaussian_filter1d(
-            f, sigma / grid_bin, axis=-1
-        ) if sigma > 0 else f  # divide by grid_bin to account for discrete spacing
+            f, sigma / grid_bin, axis=-1, output=f
+        ) if sigma > 0 else f  # smooths float arrays in place, divide by grid_bin to account for discrete spacing
 
         xbin = np.arange(np.nanmin(x), np.nanmax(x) + grid_bin, grid_bin)
+        xbin_geom = _BinGeometry.from_edges(xbin)
+
+        # spikes of all cells in one flat array, cell i is spk_t[cell_ptr[i]:cell_ptr[i+1]],
+        # so that spikes of every cell are restricted, interpolated and binned in single calls
+        spiketrains = neurons.spiketrains
+        n_cells, n_bins = len(spiketrains), xbin_geom.n_bins
+        spk_t = (
+            np.concatenate(spiketrains).astype(float) if n_cells > 0 else np.zeros(0)
+        )
+        spk_cell = np.repeat(np.arange(n_cells), [len(_) for _ in spiketrains])
 
         if epochs is not None:
             assert isinstance(epochs, core.Epoch), "epochs should be core.Epoch object"
 
-            spiketrains = [
-                np.concatenate(
-                    [
-                        spktrn[(spktrn >= epc.start) & (spktrn <= epc.stop)]
-                        for epc in epochs.to_dataframe().itertuples()
-                    ]
-                )
-                for spktrn in neurons.spiketrains
-            ]
+            # spikes of each cell stay in epoch order, as if restricted cell by cell
+            keep = _where_in_epochs(spk_t, epochs.starts, epochs.stops)
+            keep = keep[np.argsort(spk_cell[keep], kind="stable")]
             # changing x, speed, time to only run epochs so occupancy map is consistent
-            indx = np.concatenate(
-                [
-                    np.where((t >= epc.start) & (t <= epc.stop))[0]
-                    for epc in epochs.to_dataframe().itertuples()
-                ]
-            )
+            indx = _where_in_epochs(t, epochs.starts, epochs.stops)
 
             speed_thresh = None
             print("Note: speed_thresh is ignored when epochs is provided")
         else:
-            spiketrains = neurons.time_slice(t_start, t_stop).spiketrains
+            keep = (spk_t >= t_start) & (spk_t <= t_stop)
             indx = np.where(speed >= speed_thresh)[0]
+        spk_t, spk_cell = spk_t[keep], spk_cell[keep]
 
         # to avoid interpolation error, speed and position estimation for spiketrains should use time
         # and speed of entire position (not only on threshold crossing time points)
         x_thresh = x[indx]
 
-        spk_pos, spk_t, spkcounts = [], [], []
-        for spktrn in spiketrains:
-            spk_spd = np.interp(spktrn, t, speed)
-            spk_x = np.interp(spktrn, t, x)
-            if speed_thresh is not None:
-                indices = np.where(spk_spd >= speed_thresh)[0]
-                spk_x = spk_x[indices]
-                spktrn = spktrn[indices]
-
-            spk_pos.append(spk_x)
-            spk_t.append(spktrn)
-            spkcounts.append(np.histogram(spk_x, bins=xbin)[0])
-
-        spkcounts = smooth_(np.asarray(spkcounts))
-        occupancy = np.histogram(x_thresh, bins=xbin)[0] / position_srate + 1e-16
+        # position samples are equally spaced, so spikes are placed between samples directly
+        spk_x, spk_spd = _interp_uniform(spk_t, t_start, position_srate, x, speed)
+        if speed_thresh is not None:
+            keep = spk_spd >= speed_thresh
+            spk_t, spk_x, spk_cell = spk_t[keep], spk_x[keep], spk_cell[keep]
+        cell_ptr = np.concatenate(([0], np.cumsum(np.bincount(spk_cell, minlength=n_cells))))
+        spk_bin = xbin_geom.bin_indices(spk_x)
+        valid = spk_bin >= 0
+        spkcounts = np.bincount(
+            spk_cell[valid] * n_bins + spk_bin[valid], minlength=n_cells * n_bins
+        ).reshape(n_cells, n_bins)
+        # (start, stop) of each cell built once as plain ints and unpacked for both slicings
+        cells_ = list(zip(cell_ptr[:-1].tolist(), cell_ptr[1:].tolist()))
+        spk_pos = [spk_x[start:stop] for start, stop in cells_]
+        spk_t = [spk_t[start:stop] for start, stop in cells_]
+
+        # spike counts are smoothed and turned into firing rates within the same buffer
+        tuning_curve = smooth_(spkcounts.astype(map_dtype))
+        occupancy = np.asarray(_histogram1d(x_thresh, xbin), dtype=map_dtype)
+        occupancy *= 1 / position_srate  # converting to seconds
         occupancy = smooth_(occupancy)
-        tuning_curve = spkcounts / occupancy.reshape(1, -1)
+
+        # firing rate is 0 wherever the animal never was, same as Pf2D
+        inv_occupancy = np.zeros_like(occupancy)
+        np.divide(1, occupancy, out=inv_occupancy, where=occupancy > 0)
+        tuning_curve *= inv_occupancy
 
         # ---- neurons with peak firing rate above thresh ------
-        frate_thresh_indx = np.where(np.max(tuning_curve, axis=1) >= frate_thresh)[0]
-        tuning_curve = tuning_curve[frate_thresh_indx, :]
-        neuron_ids = neuron_ids[frate_thresh_indx]
-        spk_t = [spk_t[_] for _ in frate_thresh_indx]
-        spk_pos = [spk_pos[_] for _ in frate_thresh_indx]
+        # firing rates are never negative, so a threshold <= 0 keeps every neuron
+        if frate_thresh is not None and frate_thresh > 0:
+            frate_thresh_indx = np.where(np.max(tuning_curve, axis=1) >= frate_thresh)[0]
+            tuning_curve = tuning_curve[frate_thresh_indx, :]
+            neuron_ids = neuron_ids[frate_thresh_indx]
+            spk_t = [spk_t[_] for _ in frate_thresh_indx]
+            spk_pos = [spk_pos[_] for _ in frate_thresh_indx]
 
         super().__init__(
             tuning_curves=tuning_curve, coords=xbin[:-1], neuron_ids=neuron_ids
@@ -372,11 +537,12 @@ class Pf1D(core.Ratemap):
         """Slice out neurons"""
         assert (inds is None) != (ids is None), "Exactly one of 'inds' and 'ids' must be a list or array"
         if ids is not None:
-            inds = [np.where(idd == self.neuron_ids)[0][0] for idd in np.atleast_1d(ids)]
+            inds = ids_to_indices(self.neuron_ids, np.atleast_1d(ids))
         inds = np.sort(np.atleast_1d(inds))
 
-        # Make a copy and slice
-        pfslice = deepcopy(self)
+        # Shallow copy: every per-neuron attribute is replaced by a new sliced object below and the
+        # rest (position, occupancy, parameters) is shared read-only with the parent
+        pfslice = copy(self)
         pfslice.tuning_curves = self.tuning_curves[inds]
         pfslice.neuron_ids = self.neuron_ids[inds]
         pfslice.ratemap_spiketrains = [self.ratemap_spiketrains[ind] for ind in inds]
@@ -384,10 +550,11 @@ class Pf1D(core.Ratemap):
 
         return pfslice
 
-    def get_pf_data(self, sigma=1.5, plot=False, **kwargs):
+    def get_pf_data(self, sigma=1.5, plot=False, n_jobs=1, **kwargs):
         """Gets all pf data: peak heights, peak prominences, peak centers, peak edges, and peak widths
         :param: sigma: smoothing kernel width, default = 1.5
         :param: plot: bool, True = plot all placefields with peaks and widths overlaid, default = False
+        :param: n_jobs: number of jobs used to find peaks of neurons in parallel, -1 = all cores, default = 1
         :param: **kwargs: inputs to .get_pf_peaks or .get_pf_widths
 
         :return: pf_stats_df: pd.DataFrame with all place field stats"""
@@ -397,20 +564,37 @@ class Pf1D(core.Ratemap):
         kwargs_peaks = {key: value for key, value in kwargs.items() if key in peaks_keys}
         kwargs_widths = {key: value for key, value in kwargs.items() if key in ["height_thresh"]}
 
-        # Now loop through each neuron and calculate peak / width information
-        pf_stats_list = []
-        ind = 0
-        for nid in tqdm(self.neuron_ids):
-            heights, prominences, centers, tuning_curve = self.get_pf_peaks(cell_id=nid, sigma=sigma, **kwargs_peaks)
-            widths, edges = self.get_pf_widths(tuning_curve.squeeze(), heights, prominences, centers, plot=plot,
+        # Same smoothing as .get_pf_peaks, done for all neurons at once
+        tuning_curves = self.tuning_curves
+        if sigma > 0:
+            tuning_curves = gaussian_filter1d(tuning_curves, sigma=sigma, axis=1)
+
+        # Peak finding is independent for each neuron, so run it in parallel processes which only get
+        # the tuning curve of their neuron, progress is counted as neurons finish
+        peaks = list(
+            tqdm(
+                Parallel(n_jobs=n_jobs, return_as="generator")(
+                    delayed(_tuning_curve_peaks)(tuning_curve[np.newaxis], **kwargs_peaks)
+                    for tuning_curve in tuning_curves
+                ),
+                total=self.n_neurons,
+            )
+        )
+
+        # Now loop through each neuron and calculate width information, one row per peak is collected
+        # and the DataFrame is built once at the end
+        pf_stats_rows = []
+        for nid, (heights, prominences, centers), tuning_curve in zip(self.neuron_ids, peaks, tuning_curves):
+            widths, edges = self.get_pf_widths(tuning_curve, heights, prominences, centers, plot=plot,
                                                **kwargs_widths)
-            for idp, (height, prom, cent, width, edge) in enumerate(zip(heights, prominences, centers, widths, edges)):
-                pf_stats_list.append(pd.DataFrame({"cell_id": nid, "peak_no": idp, "height": height,
-                                                   "prominence": prom, "center_bin": cent, "width_bin": width,
-                                                   "left_edge": edge[0], "right_edge": edge[1]}, index=[ind]))
-                ind += 1
+            pf_stats_rows.extend(
+                {"cell_id": nid, "peak_no": idp, "height": height, "prominence": prom, "center_bin": cent,
+                 "width_bin": width, "left_edge": edge[0], "right_edge": edge[1]}
+                for idp, (height, prom, cent, width, edge) in enumerate(zip(heights, prominences, centers, widths, edges))
+            )
 
-        return pd.concat(pf_stats_list, axis=0)
+        return pd.DataFrame(pf_stats_rows, columns=["cell_id", "peak_no", "height", "prominence", "center_bin",
+                                                    "width_bin", "left_edge", "right_edge"])
 
     def get_pf_peaks(self, cell_ind=None, cell_id=None, sigma=1.5,
                      step=0.1, centroid_num_to_center=1, verbose=False, **kwargs):
@@ -430,23 +614,11 @@ class Pf1D(core.Ratemap):
         tuning_curve = pf_use.tuning_curves
         if sigma > 0:
             tuning_curve = gaussian_filter1d(pf_use.tuning_curves, sigma=sigma, axis=1)
-        peaks, idmap, promap, parentmap = getProminence(np.repeat(tuning_curve, 20, axis=0),
-                                                        step=step, centroid_num_to_center=centroid_num_to_center,
-                                                        verbose=verbose, **kwargs)
-
-        centers, heights, prominences = [], [], []
-        for ii, vv in peaks.items():
-            xii, yii = vv['center']
-            centers.append(xii)
-
-
-            z2ii = vv['height']
-            heights.append(z2ii)
-
-            pro = vv['prominence']
-            prominences.append(pro)
+        heights, prominences, centers = _tuning_curve_peaks(
+            tuning_curve, step=step, centroid_num_to_center=centroid_num_to_center, verbose=verbose, **kwargs
+        )
 
-        return np.array(heights), np.array(prominences), np.array(centers), tuning_curve
+        return heights, prominences, centers, tuning_curve
 
     def get_pf_widths(self, tuning_curve, heights, prominences, centers, height_thresh=0.5, plot=False, ax=None):
         """Gets placefield widths after obtaining peak height, location, and prominence data using .get_pf_peaks
@@ -581,6 +753,7 @@ class Pf2D:
         speed_thresh=3,
         grid_bin=1,
         sigma=1,
+        map_dtype=np.float64,
     ):
         """Calculates 2D placefields
         Parameters
@@ -591,6 +764,8 @@ class Pf2D:
             bin size of grid in centimeters, by default 10
         speed_thresh : int, optional
             speed threshold in cm/s, by default 10 cm/s
+        map_dtype : numpy dtype, optional
+            precision of occupancy and ratemaps, np.float32 halves their memory, by default np.float64
         Returns
         -------
         [type]
@@ -601,12 +776,22 @@ class Pf2D:
         #smooth_ = lambda f: gaussian_filter1d(
         #    f, sigma / grid_bin, axis=-1
         #)  # divide by grid_bin to account for discrete spacing
-        smooth_ = lambda f: gaussian_filter(f, sigma=(sigma / grid_bin, 
-                                                      sigma / grid_bin))
+        # smooths the last two (x, y) axes in place as two 1D passes, so a stack of maps is
+        # smoothed without allocating a second stack
+        smooth_ = lambda f: (
+            gaussian_filter1d(
+                gaussian_filter1d(f, sigma / grid_bin, axis=-2, output=f),
+                sigma / grid_bin,
+                axis=-1,
+                output=f,
+            )
+            if sigma > 0
+            else f
+        )
 
-        spikes = neurons.time_slice(*period).spiketrains
+        # spikes are restricted to the maze period once, inside make_pfs
+        spikes = neurons.spiketrains
         cell_ids = neurons.neuron_ids
-        nCells = len(spikes)
 
         # ----- Position---------
         xcoord = position.x
@@ -621,6 +806,7 @@ class Pf2D:
 
         x_grid = np.arange(np.nanmin(x), np.nanmax(x) + grid_bin, grid_bin)
         y_grid = np.arange(np.nanmin(y), np.nanmax(y) + grid_bin, grid_bin)
+        hist2d_ = _histogram2d_func(x_grid, y_grid)
         # x_, y_ = np.meshgrid(x_grid, y_grid)
 
         diff_posx = np.diff(x)
@@ -638,54 +824,62 @@ class Pf2D:
         t_thresh = t[running]
 
         def make_pfs(
-            t_, x_, y_, spkAll_, occupancy_, speed_thresh_, maze_, x_grid_, y_grid_
+            t_, x_, y_, spkAll_, inv_occupancy_, speed_thresh_, maze_, x_grid_, y_grid_
         ):
-            maps, spk_pos, spk_t = [], [], []
-            for cell in spkAll_:
-                # assemble spikes and position data
-                spk_maze = cell[np.where((cell > maze_[0]) & (cell < maze_[1]))]
-                spk_speed = np.interp(spk_maze, t_[1:], speed)
-                spk_y = np.interp(spk_maze, t_, y_)
-                spk_x = np.interp(spk_maze, t_, x_)
-
-                # speed threshold
-                spd_ind = np.where(spk_speed > speed_thresh_)
-                # spk_spd = spk_speed[spd_ind]
-                spk_x = spk_x[spd_ind]
-                spk_y = spk_y[spd_ind]
-
-                # Calculate maps
-                spk_map = np.histogram2d(spk_x, spk_y, bins=(x_grid_, y_grid_))[0]
-                spk_map = smooth_(spk_map)
-                maps.append(spk_map / occupancy_)
-
-                spk_t.append(spk_maze[spd_ind])
-                spk_pos.append([spk_x, spk_y])
+            # spikes of all cells in one flat array, cell i is spk_t[cell_ptr[i]:cell_ptr[i+1]],
+            # so that spikes of every cell are interpolated and binned in single calls
+            n_cells, nx, ny = len(spkAll_), len(x_grid_) - 1, len(y_grid_) - 1
+            spk_t = np.concatenate(spkAll_).astype(float) if n_cells > 0 else np.zeros(0)
+            spk_cell = np.repeat(np.arange(n_cells), [len(_) for _ in spkAll_])
+            in_maze = (spk_t > maze_[0]) & (spk_t < maze_[1])
+            spk_t, spk_cell = spk_t[in_maze], spk_cell[in_maze]
+
+            # speed threshold
+            # tracking samples are equally spaced, so spikes are placed between samples directly
+            (spk_speed,) = _interp_uniform(spk_t, t_[1], trackingRate, speed)
+            running_ = spk_speed > speed_thresh_
+            spk_t, spk_cell = spk_t[running_], spk_cell[running_]
+            spk_x, spk_y = _interp_uniform(spk_t, t_[0], trackingRate, x_, y_)
+            cell_ptr = np.concatenate(([0], np.cumsum(np.bincount(spk_cell, minlength=n_cells))))
+
+            # Calculate maps: single bincount over (cell, x bin, y bin), then smoothed and
+            # divided together
+            ix = _BinGeometry.from_edges(x_grid_).bin_indices(spk_x)
+            iy = _BinGeometry.from_edges(y_grid_).bin_indices(spk_y)
+            valid = (ix >= 0) & (iy >= 0)
+            maps = np.bincount(
+                ((spk_cell * nx + ix) * ny + iy)[valid], minlength=n_cells * nx * ny
+            ).reshape(n_cells, nx, ny).astype(map_dtype)
+
+            cells_ = list(zip(cell_ptr[:-1].tolist(), cell_ptr[1:].tolist()))
+            spk_pos = [[spk_x[start:stop], spk_y[start:stop]] for start, stop in cells_]
+            spk_t = [spk_t[start:stop] for start, stop in cells_]
+
+            maps = smooth_(maps)
+            maps *= inv_occupancy_
 
             return maps, spk_pos, spk_t
 
         # --- occupancy map calculation -----------
         # NRK todo: might need to normalize occupancy so sum adds up to 1
-        occupancy = np.histogram2d(x_thresh, y_thresh, bins=(x_grid, y_grid))[0]
-        occupancy = occupancy / trackingRate + 10e-16  # converting to seconds
+        occupancy = hist2d_(x_thresh, y_thresh).astype(map_dtype)
+        occupancy *= 1 / trackingRate  # converting to seconds, in place
         occupancy = smooth_(occupancy)
 
+        # shared by all cells: firing rate is 0 wherever the animal never was
+        inv_occupancy = np.zeros_like(occupancy)
+        np.divide(1, occupancy, out=inv_occupancy, where=occupancy > 0)
+
         maps, spk_pos, spk_t = make_pfs(
-            t, x, y, spikes, occupancy, speed_thresh, period, x_grid, y_grid
+            t, x, y, spikes, inv_occupancy, speed_thresh, period, x_grid, y_grid
         )
 
         # ---- cells with peak frate abouve thresh ------
-        good_cells_indx = [
-            cell_indx
-            for cell_indx in range(nCells)
-            if np.max(maps[cell_indx]) > frate_thresh
-        ]
-
-        get_elem = lambda list_: [list_[_] for _ in good_cells_indx]
+        good_cells_indx = np.where(maps.max(axis=(1, 2), initial=0) > frate_thresh)[0]
 
-        self.spk_pos = get_elem(spk_pos)
-        self.spk_t = get_elem(spk_t)
-        self.ratemaps = get_elem(maps)
+        self.spk_pos = [spk_pos[_] for _ in good_cells_indx]
+        self.spk_t = [spk_t[_] for _ in good_cells_indx]
+        self.ratemaps = list(maps[good_cells_indx])
         self.cell_ids = cell_ids[good_cells_indx]
         self.occupancy = occupancy
         self.speed = speed
@@ -732,19 +926,19 @@ class Pf2D:
             else:
                 fignum = 1
 
+        suptitle = f"Place maps with peak firing rate (speed_threshold = {thresh})"
         figures, gs = [], []
         for fig_ind in range(nfigures):
             fig = plt.figure(fignum + fig_ind, figsize=(6, 10), clear=True)
             gs.append(GridSpec(subplots[0], subplots[1], figure=fig))
             fig.subplots_adjust(hspace=0.4)
-            fig.suptitle(
-                "Place maps with peak firing rate (speed_threshold = "
-                + str(thresh)
-                + ")"
-            )
+            fig.suptitle(suptitle)
             figures.append(fig)
 
-        for cell, pfmap in enumerate(map_use):
+        # peak rate of every cell in one reduction, used for both normalizing and the title
+        peak_frates = np.nanmax(np.asarray(map_use), axis=(1, 2)) if nCells > 0 else []
+
+        for cell, (pfmap, peak_frate) in enumerate(zip(map_use, peak_frates)):
 
             ind = cell // np.prod(subplots)
             subplot_ind = cell % np.prod(subplots)
@@ -752,14 +946,14 @@ class Pf2D:
             im = ax1.pcolorfast(
                 self.xgrid,
                 self.ygrid,
-                np.rot90(np.fliplr(pfmap)) / np.max(pfmap),
+                np.rot90(np.fliplr(pfmap)) / peak_frate,
                 cmap="jet",
                 vmin=0,
             )  # rot90(flipud... is necessary to match plotRaw configuration.
             # max_frate =
             ax1.axis("off")
             ax1.set_title(
-                f"Cell {self.cell_ids[cell]} \n{round(np.nanmax(pfmap),2)} Hz"
+                f"Cell {self.cell_ids[cell]} \n{round(float(peak_frate), 2)} Hz"
             )
 
             # cbar_ax = fig.add_axes([0.9, 0.3, 0.01, 0.3])
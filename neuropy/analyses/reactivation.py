@@ -9,6 +9,7 @@ import scipy.stats as stats
 from scipy.ndimage import gaussian_filter
 from sklearn.decomposition import PCA, FastICA
 from typing import Union
+from joblib import Parallel, delayed
 # from ..utils.mathutil import getICA_Assembly
 from .. import core
 
@@ -60,6 +61,7 @@ class ExplainedVariance(core.DataWriter):
         slideby: int = 300,
         pairs_bool=None,
         ignore_epochs: core.Epoch = None,
+        n_jobs=1,
     ):
         """Explained variance measure for assessing reactivation of neuronal activity using pairwise correlations.
 
@@ -83,6 +85,8 @@ class ExplainedVariance(core.DataWriter):
             a 2d symmetric boolean array of size n_neurons x n_neurons specifying which pairs to be kept for calculating explained variance, by default None
         ignore_epochs : core.Epoch, optional
             ignore calculation for these epochs, helps with noisy epochs, by default None
+        n_jobs : int, optional
+            number of threads used to calculate pairwise correlations of windows, by default 1
         """
         super().__init__()
         self.neurons = neurons
@@ -102,9 +106,9 @@ class ExplainedVariance(core.DataWriter):
         self.slideby = slideby
         self.pairs_bool = pairs_bool
         self.ignore_epochs = ignore_epochs
-        self._calculate()
+        self._calculate(n_jobs=n_jobs)
 
-    def _calculate(self):
+    def _calculate(self, n_jobs=1):
         # TODO: Think about directly working on binned spiketrains, will be little faster but may require redundant additions like pariwise_corr as separate function
 
         matching = np.arange(self.matching[0], self.matching[1])
@@ -150,34 +154,39 @@ class ExplainedVariance(core.DataWriter):
                 )
                 .get_pairwise_corr(pairs_bool=self.pairs_bool)
             )
+
+            def window_paircorr(w):
+                # windows are independent, errstate is set again as worker threads don't inherit it
+                with np.errstate(all="ignore", invalid="ignore"):
+                    return (
+                        self.neurons.time_slice(w[0], w[1])
+                        .get_binned_spiketrains(self.bin_size)
+                        .get_pairwise_corr(pairs_bool=self.pairs_bool)
+                    )
+
             n_matching_windows = matching_windows.shape[0]
-            matching_paircorr = []
-            for w in matching_windows:
-                matching_paircorr.append(
-                    self.neurons.time_slice(w[0], w[1])
-                    .get_binned_spiketrains(self.bin_size)
-                    .get_pairwise_corr(pairs_bool=self.pairs_bool)
-                )
+            matching_paircorr = Parallel(n_jobs=n_jobs, require="sharedmem")(
+                delayed(window_paircorr)(w) for w in matching_windows
+            )
 
             n_control_windows = control_windows.shape[0]
-            control_paircorr = []
-            for w in control_windows:
-                control_paircorr.append(
-                    self.neurons.time_slice(w[0], w[1])
-                    .get_binned_spiketrains(self.bin_size)
-                    .get_pairwise_corr(pairs_bool=self.pairs_bool)
-                )
+            control_paircorr = Parallel(n_jobs=n_jobs, require="sharedmem")(
+                delayed(window_paircorr)(w) for w in control_windows
+            )
 
             partial_corr = np.zeros((n_control_windows, n_matching_windows))
             rev_partial_corr = np.zeros((n_control_windows, n_matching_windows))
+            # valid (non-nan) pairs are found once per window instead of dropna on every combination
+            control_valid = [~np.isnan(c_pairs) for c_pairs in control_paircorr]
             print(f"Calculating partial correlations for {len(matching_paircorr)} time windows")
             for m_i, m_pairs in enumerate(tqdm(matching_paircorr)):
+                tm_valid = ~np.isnan(template_corr) & ~np.isnan(m_pairs)
                 for c_i, c_pairs in enumerate(control_paircorr):
                     df = pd.DataFrame({"t": template_corr, "m": m_pairs, "c": c_pairs})
                     try:
                         # if ((~np.isnan(df["m"])).sum() > 2) and ((~np.isnan(df["c"])).sum() > 2):
                         # Make sure you have at least 3 neurons-pairs with valid pairwise correlations in the windows in question
-                        if df[['t', 'm', 'c']].dropna().shape[0] > 2:
+                        if np.count_nonzero(tm_valid & control_valid[c_i]) > 2:
                             partial_corr[c_i, m_i] = pg.partial_corr(
                                 df, x="t", y="m", covar="c"
                             ).r
@@ -46,10 +46,8 @@ class DataWriter:
 
     def to_dict(self):
         d = dict()
-        attrs = self.__dict__.keys()
-        for k in attrs:
-            key_data = getattr(self, k)
-
+        # instance attributes are read straight from __dict__, no getattr lookup per attribute
+        for k, key_data in self.__dict__.items():
             # To avoid pickling error when reading pandas object from .npy file
             if isinstance(key_data, pd.DataFrame):
                 key_data = key_data.to_dict()
@@ -5,7 +5,6 @@ from .datawriter import DataWriter
 from pathlib import Path
 import scipy.signal as sg
 import typing
-from copy import deepcopy, copy
 
 
 def _unpack_args(values, fs=1):
@@ -75,14 +74,14 @@ class Epoch(DataWriter):
         # Note that the following would be MUCH simpler but throws a "SettingWithCopyWarning"
         # so we have to add the convoluted code below to avoid it
         # epochs.loc[:, "label"] = epochs.loc[:, "label"].astype("str")
-        epochs_labels_str = copy(epochs["label"].astype("str"))
+        epochs_labels_str = epochs["label"].astype("str")  # astype already returns a new Series
         epochs = epochs.drop(columns="label", inplace=False)  # this also throws a warning if used with inplace=True
         epochs.loc[:, "label"] = epochs_labels_str
 
-        # Sort
+        # Sort, sort_values returns a new frame so the caller's DataFrame is never shared
         epochs = epochs.sort_values(by=["start"]).reset_index(drop=True)
 
-        return epochs.copy()
+        return epochs
 
     @property
     def starts(self):
@@ -149,11 +148,11 @@ class Epoch(DataWriter):
 
     def add_epoch_by_index(self, index, start, stop, label=""):
         assert np.mod(index, 1) > 0, "index must be a non-integer, e.g. -0.5 or 11.5"
-        epochs_df = deepcopy(self._epochs)
         line = pd.DataFrame(
             {"start": start, "stop": stop, "label": label}, index=[index]
         )
-        epochs_df = pd.concat((epochs_df, line), ignore_index=False)
+        # concat returns a new frame, self._epochs is not modified
+        epochs_df = pd.concat((self._epochs, line), ignore_index=False)
         self._epochs = epochs_df.sort_index().reset_index(drop=True)
 
     def shift(self, dt, other_fields: None or str or list = None):
@@ -209,7 +208,8 @@ class Epoch(DataWriter):
         #     data = self._epochs[self._epochs["label"].isin(i)].copy()
         elif isinstance(i, list):
             assert all(isinstance(_, str) for _ in i), "All entries in epochs slicing list must be str"
-            data = self._epochs[[label in i for label in self._epochs["label"]]]
+            # Series.isin hashes the label column (codes for categorical or arrow-backed strings)
+            data = self._epochs[self._epochs["label"].isin(i)]
         elif isinstance(i, (int, np.integer)):
             data = self._epochs.iloc[[i]].copy()
         else:
@@ -240,16 +240,16 @@ class Epoch(DataWriter):
         t_start, t_stop = super()._time_slice_params(t_start, t_stop)
         starts = self.starts
         stops = self.stops
+        # kept rows and all columns but duration are gathered in one copy
+        columns = self._epochs.columns != "duration"
 
         if strict:
             keep = (starts >= t_start) & (stops <= t_stop)  # strictly inside
-            epoch_df = self.to_dataframe()[keep].reset_index(drop=True)
-            epoch_df = epoch_df.drop(["duration"], axis=1)
+            epoch_df = self._epochs.loc[keep, columns].reset_index(drop=True)
         else:
             # also include and trim epochs: that span the entire range, epochs that start before but end inside, epochs that start inside but end outside
             keep = (starts <= t_stop) & (stops >= t_start)
-            epoch_df = self.to_dataframe()[keep].reset_index(drop=True)
-            epoch_df = epoch_df.drop(["duration"], axis=1)
+            epoch_df = self._epochs.loc[keep, columns].reset_index(drop=True)
             epoch_df.loc[epoch_df["start"] < t_start, "start"] = t_start
             epoch_df.loc[epoch_df["stop"] > t_stop, "stop"] = t_stop
 
@@ -295,7 +295,7 @@ class Epoch(DataWriter):
             labels = [labels]
 
         assert np.all([isinstance(_, str) for _ in labels])
-        df = self._epochs[np.isin(self.labels, labels)].reset_index(drop=True)
+        df = self._epochs[self._epochs["label"].isin(labels)].reset_index(drop=True)
         return Epoch(epochs=df)
 
     @staticmethod
@@ -315,21 +315,13 @@ class Epoch(DataWriter):
         t : np.array
             time array of same length as arr giving corresponding time in seconds, if provided it overrides dt
         """
-        unique_labels = np.unique(arr)
-        pad = lambda x: np.pad(x, (1, 1), "constant", constant_values=(0, 0))
+        arr = np.asarray(arr)
 
-        starts, stops, labels = [], [], []
-        for l in unique_labels:
-            l_transition = np.diff(pad(np.where(arr == l, 1, 0)))
-            l_start = np.where(l_transition == 1)[0]
-            l_stop = np.where(l_transition == -1)[0]
-
-            starts.append(l_start)
-            stops.append(l_stop)
-            labels.extend([l] * len(l_start))
-
-        starts = np.concatenate(starts)
-        stops = np.concatenate(stops)
+        # runs of the same label in a single pass, each run starts where the label changes
+        change = np.flatnonzero(arr[1:] != arr[:-1]) + 1
+        starts = np.concatenate(([0], change))
+        stops = np.concatenate((change, [len(arr)]))
+        labels = arr[starts]
 
         # padding correction
         stops[stops == len(arr)] = len(arr) - 1
@@ -458,7 +450,8 @@ class Epoch(DataWriter):
         core.Epoch
             epochs after merging neighbours sharing same label and boundary
         """
-        ep_times, ep_stops, ep_labels = (deepcopy(self.starts), deepcopy(self.stops), deepcopy(self.labels))
+        # plain array copies, labels are immutable strings so there is nothing deeper to copy
+        ep_times, ep_stops, ep_labels = (self.starts.copy(), self.stops.copy(), self.labels.copy())
         ep_durations = self.durations
 
         ind_delete = []
@@ -576,7 +569,8 @@ class Epoch(DataWriter):
 
         duration = t_stop - t_start
 
-        ep = self._epochs.copy()
+        # boolean indexing already returns a new frame, no need to copy all epochs first
+        ep = self._epochs
         ep = ep[(ep.stop > t_start) & (ep.start < t_stop)].reset_index(drop=True)
         if not ignore_gaps:
             assert ep.shape[0] > 0, "cannot have empty time gaps between epoch labels with ignore_gaps=False"
@@ -587,18 +581,14 @@ class Epoch(DataWriter):
             if ep["stop"].iloc[-1] > t_stop:
                 ep.at[ep.index[-1], "stop"] = t_stop
 
-            ep["duration"] = ep.stop - ep.start
-
-            ep_group = ep.groupby("label").sum(numeric_only=True).duration / duration
-
-            label_proportion = {}
-            for label in self.get_unique_labels():
-                label_proportion[label] = 0.0
+            ep["duration"] = ep["stop"].to_numpy() - ep["start"].to_numpy()
 
-            for state in ep_group.index.values:
-                label_proportion[state] = ep_group[state]
+            # labels are mapped to integer codes so durations are summed by bincount, no groupby hashing
+            unique_labels = self.get_unique_labels()
+            label_inds = np.searchsorted(unique_labels, ep["label"].to_numpy())
+            label_sums = np.bincount(label_inds, weights=ep["duration"].to_numpy(), minlength=len(unique_labels))
 
-            return label_proportion
+            return dict(zip(unique_labels, label_sums / duration))
         else:
             return None
 
@@ -610,14 +600,11 @@ class Epoch(DataWriter):
         dict
             dictionary containing duration of each unique label
         """
-        labels = self.labels
-        durations = self.durations
-        unique_labels = self.get_unique_labels()
-        label_durations = {}
-        for label in unique_labels:
-            label_durations[label] = durations[labels == label].sum()
+        # one pass summing durations into their label, instead of a mask per label
+        unique_labels, label_inds = np.unique(self.labels, return_inverse=True)
+        sums = np.bincount(label_inds, weights=self.durations, minlength=len(unique_labels))
 
-        return label_durations
+        return dict(zip(unique_labels, sums))
 
     def resample_labeled_epochs(self, res, t_start=None, t_stop=None, merge_neighbors=True):
         """Resample epochs to different size blocks using a winner take all method to assign
@@ -688,14 +675,21 @@ class Epoch(DataWriter):
         times = np.arange(t_start, t_stop, bin_size)
 
         # Super slow
-        time_bool = np.zeros_like(times).astype(bool)
         # for start, stop in zip(self.starts, self.stops):
         # time_bool = time_bool | ((times >= start) & (times < stop))
 
-        for start_ind, end_ind in zip(
-            ((self.starts - t_start) / bin_size).astype(int), ((self.stops - t_start) / bin_size).astype(int)
-        ):
-            time_bool[start_ind:end_ind] = True
+        # each epoch covers time_bool[start_ind:end_ind], marked for all epochs at once by counting
+        # epoch starts minus epoch ends up to each bin
+        n_times = len(times)
+        wrap = lambda ind: np.where(ind < 0, np.maximum(ind + n_times, 0), np.minimum(ind, n_times))
+        start_ind = wrap(((self.starts - t_start) / bin_size).astype(int))
+        end_ind = wrap(((self.stops - t_start) / bin_size).astype(int))
+        valid = start_ind < end_ind
+        n_open = np.cumsum(
+            np.bincount(start_ind[valid], minlength=n_times + 1)
+            - np.bincount(end_ind[valid], minlength=n_times + 1)
+        )
+        time_bool = n_open[:n_times] > 0
 
         return times, time_bool
 
@@ -796,12 +790,13 @@ class Epoch(DataWriter):
         Boolean array
 
         """
-        time_bool = np.zeros_like(t)
-
-        for e in self.as_array():
-            time_bool[np.where((t >= e[0]) & (t <= e[1]))[0]] = 1
+        # epochs (possibly overlapping) containing t = epochs started by t - epochs stopped before t,
+        # epochs with stop < start contain no t and would unbalance the count
+        valid = self.starts <= self.stops
+        n_started = np.searchsorted(np.sort(self.starts[valid]), t, side="right")
+        n_stopped = np.searchsorted(np.sort(self.stops[valid]), t, side="left")
 
-        return time_bool.astype("bool")
+        return n_started > n_stopped
 
     @property
     def epochs(self):
@@ -844,12 +839,12 @@ def combine_epochs(epochs_df: pd.DataFrame, inplace: bool = True):
     all([col in epochs_df.columns for col in ["start", "stop"]])
 
     # First find epochs that overlap and get id to replace with
+    # compared on plain arrays, iterrows builds a Series for every row
+    starts, stops = epochs_df["start"].to_numpy(), epochs_df["stop"].to_numpy()
     start_overlaps, stop_overlaps = [], []
-    for ide, epoch in epochs_df.iterrows():
-        overlap_start = np.bitwise_and(epoch['start'] > epochs_df['start'],
-                                       epoch['start'] < epochs_df['stop'])
-        overlap_stop = np.bitwise_and(epoch['stop'] > epochs_df['start'],
-                                      epoch['stop'] < epochs_df['stop'])
+    for ide, start, stop in zip(epochs_df.index, starts, stops):
+        overlap_start = np.bitwise_and(start > starts, start < stops)
+        overlap_stop = np.bitwise_and(stop > starts, stop < stops)
         if overlap_start.sum() == 1:
             start_overlap_id = np.where(overlap_start)[0][0]
             #             print('epoch ' + str(ide) + ' overlap start w epoch '
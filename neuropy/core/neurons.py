@@ -1,11 +1,11 @@
 import numpy as np
 import pandas as pd
-from ..utils.mathutil import gaussian_kernel1D
+from ..utils.mathutil import gaussian_kernel1D, ids_to_indices
 import scipy.signal as sg
 from .datawriter import DataWriter
 from . import Epoch
 from .. import core
-from copy import deepcopy
+from copy import copy
 from joblib import Parallel, delayed
 from scipy import stats
 from scipy.ndimage import gaussian_filter1d
@@ -152,26 +152,26 @@ class Neurons(DataWriter):
         return f"{self.__class__.__name__}\n n_neurons: {self.n_neurons}\n t_start: {self.t_start}\n t_stop: {self.t_stop}\n neuron_type: {neuron_types}"
 
     def time_slice(self, t_start=None, t_stop=None, zero_spike_times=False):
-        """zero_spike_times = True will subtract t_start from all spike times"""
+        """zero_spike_times = True will subtract t_start from all spike times. The small per neuron
+        arrays are copied, waveforms are shared with this object."""
         t_start, t_stop = super()._time_slice_params(t_start, t_stop)
-        neurons = deepcopy(self)
         if zero_spike_times:
-            spiketrains = [t[(t >= t_start) & (t <= t_stop)] - t_start for t in neurons.spiketrains]
+            spiketrains = [t[(t >= t_start) & (t <= t_stop)] - t_start for t in self.spiketrains]
             t_stop = t_stop - t_start
             t_start = 0
         else:
-            spiketrains = [t[(t >= t_start) & (t <= t_stop)] for t in neurons.spiketrains]
+            spiketrains = [t[(t >= t_start) & (t <= t_stop)] for t in self.spiketrains]
 
         return Neurons(
             spiketrains=spiketrains,
             t_stop=t_stop,
             t_start=t_start,
-            sampling_rate=neurons.sampling_rate,
-            neuron_ids=neurons.neuron_ids,
-            neuron_type=neurons.neuron_type,
-            waveforms=neurons.waveforms,
-            peak_channels=neurons.peak_channels,
-            shank_ids=neurons.shank_ids,
+            sampling_rate=self.sampling_rate,
+            neuron_ids=copy(self.neuron_ids),
+            neuron_type=copy(self.neuron_type),
+            waveforms=self.waveforms,
+            peak_channels=copy(self.peak_channels),
+            shank_ids=copy(self.shank_ids),
         )
 
     def ignore_spikes_in_epochs(
@@ -197,33 +197,33 @@ class Neurons(DataWriter):
             epochs are trimmed to [t_start, t_stop] before removal.
         """
         if ignore_epochs is None or len(ignore_epochs) == 0:
-            return self if in_place else deepcopy(self)
-
-        if (t_start is not None) or (t_stop is not None):
+            ep = None
+        elif (t_start is not None) or (t_stop is not None):
             # Use current object bounds as defaults
             ts = self.t_start if t_start is None else t_start
             te = self.t_stop if t_stop is None else t_stop
-            ep = ignore_epochs.time_slice(ts, te, strict=False)
+            ep = ignore_epochs.time_slice(ts, te, strict=False).merge_neighbors().merge(0)
         else:
-            ep = ignore_epochs
-
-        ep = ep.merge_neighbors().merge(0)
+            ep = ignore_epochs.merge_neighbors().merge(0)
 
-        if len(ep) == 0:
-            return self if in_place else deepcopy(self)
-
-        ep_bins = ep.flatten()
+        if ep is None or len(ep) == 0:
+            # nothing to remove, the new Neurons gets its own array of the same spike trains
+            if in_place:
+                return self
+            new_spktrains = self.spiketrains
+        else:
+            ep_bins = ep.flatten()
 
-        new_spktrains = []
-        for st in self.spiketrains:
-            # digitize returns the index of the right bin edge each spike falls into
-            bin_loc = np.digitize(st, ep_bins)
-            keep = (bin_loc % 2 == 0)
-            new_spktrains.append(st[keep])
+            new_spktrains = []
+            for st in self.spiketrains:
+                # digitize returns the index of the right bin edge each spike falls into
+                bin_loc = np.digitize(st, ep_bins)
+                keep = (bin_loc % 2 == 0)
+                new_spktrains.append(st[keep])
 
-        if in_place:
-            self.spiketrains = np.array(new_spktrains, dtype="object")
-            return self
+            if in_place:
+                self.spiketrains = np.array(new_spktrains, dtype="object")
+                return self
 
         return Neurons(
             spiketrains=np.array(new_spktrains, dtype="object"),
@@ -237,12 +237,11 @@ class Neurons(DataWriter):
             peak_channels=self.peak_channels,
             shank_ids=self.shank_ids,
             clu_q=self.clu_q,
-            metadata=self.metadata,
+            metadata=copy(self.metadata),
         )
 
     def neuron_slice(self, neuron_inds=None, neuron_ids=None):
-        neurons = deepcopy(self)
-
+        # attributes are sliced below, the selected spiketrains are shared like __getitem__
         if neuron_inds is not None and neuron_ids is not None:
             raise ValueError("Specify either neuron_inds or neuron_ids, but not both.")
 
@@ -260,7 +259,7 @@ class Neurons(DataWriter):
                 neuron_ids = [neuron_ids]
 
             # Find the positions corresponding to the given neuron IDs
-            positions = np.where(np.isin(neurons.neuron_ids, neuron_ids))[0]
+            positions = np.where(np.isin(self.neuron_ids, neuron_ids))[0]
             if len(positions) == 0:
                 raise ValueError(f"No neurons found for given neuron_ids: {neuron_ids}")
 
@@ -268,23 +267,23 @@ class Neurons(DataWriter):
             raise ValueError("Must specify either neuron_inds or neuron_ids.")
 
         # Extract data using the found positions
-        spiketrains = neurons.spiketrains[positions]
-        neuron_type = None if neurons.neuron_type is None else neurons.neuron_type[positions]
-        waveforms = None if neurons.waveforms is None else neurons.waveforms[positions]
-        waveforms_amplitude = None if neurons.waveforms_amplitude is None else neurons.waveforms_amplitude[positions]
-        peak_channels = None if neurons.peak_channels is None else neurons.peak_channels[positions]
-        shank_ids = None if neurons.shank_ids is None else neurons.shank_ids[positions]
-        clu_q = None if neurons.clu_q is None else neurons.clu_q[positions]
+        spiketrains = self.spiketrains[positions]
+        neuron_type = None if self.neuron_type is None else self.neuron_type[positions]
+        waveforms = None if self.waveforms is None else self.waveforms[positions]
+        waveforms_amplitude = None if self.waveforms_amplitude is None else self.waveforms_amplitude[positions]
+        peak_channels = None if self.peak_channels is None else self.peak_channels[positions]
+        shank_ids = None if self.shank_ids is None else self.shank_ids[positions]
+        clu_q = None if self.clu_q is None else self.clu_q[positions]
 
         # Ensure neuron_ids remains a NumPy array and retains its original values
-        sliced_neuron_ids = np.array(neurons.neuron_ids)[positions]
+        sliced_neuron_ids = np.array(self.neuron_ids)[positions]
 
         # Create and return the new Neurons object
         return Neurons(
             spiketrains=spiketrains,
-            t_stop=neurons.t_stop,
-            t_start=neurons.t_start,
-            sampling_rate=neurons.sampling_rate,
+            t_stop=self.t_stop,
+            t_start=self.t_start,
+            sampling_rate=self.sampling_rate,
             neuron_ids=sliced_neuron_ids,  # Now a NumPy array
             neuron_type=neuron_type,  # Still an np.ndarray
             waveforms=waveforms,
@@ -306,7 +305,6 @@ class Neurons(DataWriter):
         feature_dict = {}
         for feature in ["spiketrains", "neuron_ids", "neuron_type", "waveforms",
                         "peak_channels", "shank_ids"]:
-            print(f"{feature} with kind={getattr(self, feature).dtype.kind}")
             # try:
             if feature in ["spiketrains", "neuron_type", "waveforms"]:
                 feature_dict[feature] = np.concatenate((getattr(self, feature),
@@ -336,10 +334,10 @@ class Neurons(DataWriter):
         if isinstance(neuron_type, str):
             indices = self.neuron_type == neuron_type
         if isinstance(neuron_type, list):
-            indices = np.any(
-                np.vstack([ntype == self.neuron_type for ntype in neuron_type]), axis=0
-            )
-        return self[indices]
+            # one membership test instead of a full comparison per requested type
+            indices = np.isin(np.asarray(self.neuron_type), neuron_type)
+        # integer indices, so the mask is scanned once rather than for every sliced attribute
+        return self[np.flatnonzero(indices)]
 
     def _check_integrity(self):
         assert isinstance(self.spiketrains, np.ndarray)
@@ -378,14 +376,13 @@ class Neurons(DataWriter):
 
     def get_above_firing_rate(self, thresh: float):
         """Return neurons which have firing rate above thresh"""
-        indices = self.firing_rate > thresh
+        indices = np.flatnonzero(self.firing_rate > thresh)
         return self[indices]
 
     def get_by_id(self, ids):
         """Returns neurons object with neuron_ids equal to ids"""
         # indices = np.isin(self.neuron_ids, ids, assume_unique=True)
-        indices = np.array([np.where(self.neuron_ids == _)[0][0] for _ in ids])
-        return self[indices]
+        return self[ids_to_indices(self.neuron_ids, ids)]
 
     def to_dataframe(self):
         """Generates a pandas dataframe with some descriptions about the neurons"""
@@ -442,9 +439,10 @@ class Neurons(DataWriter):
         n_bins = np.floor(duration / bin_size)
         # bins = np.arange(self.t_start, self.t_stop + bin_size, bin_size)
         bins = np.arange(n_bins + 1) * bin_size + self.t_start
-        spike_counts = np.asarray(
-            [np.histogram(_, bins=bins)[0] for _ in self.spiketrains]
-        ).astype("float")
+        # counts are written straight into one float array, no per neuron list to stack and cast
+        spike_counts = np.empty((len(self.spiketrains), len(bins) - 1), dtype="float")
+        for counts, spktrn in zip(spike_counts, self.spiketrains):
+            counts[:] = np.histogram(spktrn, bins=bins)[0]
         if ignore_epochs is not None:
             ignore_bins = ignore_epochs.flatten()
             ignore_indices = np.digitize(bins[:-1], ignore_bins) % 2 == 1
@@ -106,7 +106,8 @@ class Position(DataWriter):
 
     @property
     def t_stop(self):
-        return self.time[-1]
+        # last timestamp of self.time, without building the whole time array
+        return (self.n_frames - 1) * (1 / self.sampling_rate) + self.t_start
 
     @property
     def time(self):
@@ -137,7 +138,10 @@ class Position(DataWriter):
 
     def get_smoothed(self, sigma):
         dt = 1 / self.sampling_rate
-        smooth = lambda x: gaussian_filter1d(x, sigma=sigma / dt, axis=-1)
+        if sigma > 0:
+            smooth = lambda x: gaussian_filter1d(x, sigma=sigma / dt, axis=-1)
+        else:
+            smooth = lambda x: x.copy()  # nothing to smooth, skip scipy
 
         if self.traces_rot is not None:
             return Position(
@@ -1,5 +1,6 @@
 import numpy as np
 from . import DataWriter
+from ..utils.mathutil import ids_to_indices
 from scipy import stats, interpolate
 from scipy.ndimage import gaussian_filter1d
 
@@ -139,7 +140,7 @@ class Ratemap(DataWriter):
         """Slice neuron indexes (inds) or number (ids). Cannot specify both """
         assert (inds is None) != (ids is None), "Exactly one of 'inds' and 'ids' must be a list or array"
         if ids is not None:
-            inds = [np.where(idd == self.neuron_ids)[0][0] for idd in ids]
+            inds = ids_to_indices(self.neuron_ids, np.atleast_1d(ids))
         inds = np.sort(inds)
         return Ratemap(
             tuning_curves=self.tuning_curves[inds],
@@ -151,12 +152,15 @@ class Ratemap(DataWriter):
 
     @property
     def x_binsize(self):
-        return np.diff(self.x_coords())[0]
+        # coords are equally spaced (checked when set), first two are enough
+        x = self.x_coords()
+        return x[1] - x[0]
 
     @property
     def y_binsize(self):
         if self.y is not None:
-            return np.diff(self.y_coords())[0]
+            y = self.y_coords()
+            return y[1] - y[0]
 
     @property
     def n_neurons(self):
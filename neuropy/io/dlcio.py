@@ -209,7 +209,7 @@ class DLC:
             self.timestamps = self.timestamps.iloc[isort, :]
 
         # Reorder timestamps for position data if necessary
-        if not np.all(isort == np.arange(self.timestamps.shape[0])):
+        if not np.array_equal(isort, np.arange(self.timestamps.shape[0])):
             print(
                 "WARNING: Timestamps imported out of order. Resorting position data and setting .speed and .pos_smooth to None")
             self.pos_data = self.pos_data.iloc[isort, :]
@@ -266,6 +266,19 @@ def contiguous_regions(condition):
     return idx
 
 
+def ids_to_indices(all_ids, ids):
+    """Index into all_ids of the first occurrence of each of ids, keeping the order of ids.
+    Found by one binary search over the sorted all_ids, raises IndexError for ids not in all_ids."""
+    all_ids, ids = np.asarray(all_ids), np.asarray(ids)
+    order = np.argsort(all_ids, kind="stable")
+    pos = np.searchsorted(all_ids, ids, sorter=order).clip(max=len(order) - 1)
+    indices = order[pos]
+    missing = all_ids[indices] != ids
+    if np.any(missing):
+        raise IndexError(f"neuron_ids not found: {ids[missing]}")
+    return indices
+
+
 def schmitt_threshold(arr: np.array, low_thresh: float, high_thresh: float):
     """Detect high and low states in an array using two thresholds (Schmitt trigger). Works best for bimodal data.
 
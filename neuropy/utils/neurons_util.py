@@ -275,7 +275,7 @@ def calculate_neurons_acg(
 
     correlo = []
     for cell in spikes:
-        cell_id = np.zeros(len(cell)).astype(int)
+        cell_id = np.zeros(len(cell), dtype=int)
         acg = correlograms(
             cell,
             cell_id,
@@ -313,11 +313,9 @@ def calculate_neurons_ccg(neurons: core.Neurons, bin_size=0.001, window_size=0.2
     """
     spikes = neurons.spiketrains
     t = np.arange(window_size / bin_size + 1) * bin_size - window_size / 2
-    ccgs = np.zeros((len(spikes), len(spikes), len(t))) * np.nan
+    ccgs = np.full((len(spikes), len(spikes), len(t)), np.nan)
     spike_ind = np.asarray([_ for _ in range(len(spikes)) if spikes[_].size != 0])
-    clus_id = np.concatenate([[_] * len(spikes[_]) for _ in range(len(spikes))]).astype(
-        int
-    )
+    clus_id = np.repeat(np.arange(len(spikes)), [len(_) for _ in spikes])
     sort_ind = np.argsort(np.concatenate(spikes))
     spikes = np.concatenate(spikes)[sort_ind]
     clus_id = clus_id[sort_ind]
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -219,13 +220,22 @@ class Spectrogram(core.Signal):
         )
 
 
+@lru_cache(maxsize=None)
+def _butter(order, Wn, btype):
+    """Butterworth (b, a) coefficients, designed once per (order, Wn, btype) as filters are usually
+    applied with the same parameters to many windows or channels. Wn is a float or a tuple.
+    Returned arrays are shared between calls and should not be modified.
+    """
+    return sg.butter(order, Wn, btype=btype)
+
+
 class filter_sig:
     @staticmethod
     def bandpass(signal, lf, hf, fs=1250, order=3, ax=-1):
         if isinstance(signal, core.Signal):
             y = signal.traces
             nyq = 0.5 * signal.sampling_rate
-            b, a = sg.butter(order, [lf / nyq, hf / nyq], btype="bandpass")
+            b, a = _butter(order, (lf / nyq, hf / nyq), "bandpass")
             yf = sg.filtfilt(b, a, y, axis=-1)
             yf = core.Signal(
                 traces=yf,
@@ -235,7 +245,7 @@ class filter_sig:
             )
         else:
             nyq = 0.5 * fs
-            b, a = sg.butter(order, [lf / nyq, hf / nyq], btype="bandpass")
+            b, a = _butter(order, (lf / nyq, hf / nyq), "bandpass")
             yf = sg.filtfilt(b, a, signal, axis=ax)
 
         return yf
@@ -245,7 +255,7 @@ class filter_sig:
         if isinstance(signal, core.Signal):
             y = signal.traces
             nyq = 0.5 * signal.sampling_rate
-            b, a = sg.butter(order, cutoff / nyq, btype="highpass")
+            b, a = _butter(order, cutoff / nyq, "highpass")
             yf = sg.filtfilt(b, a, y, axis=-1)
             yf = core.Signal(
                 traces=yf,
@@ -256,7 +266,7 @@ class filter_sig:
         else:
             nyq = 0.5 * fs
 
-            b, a = sg.butter(order, cutoff / nyq, btype="highpass")
+            b, a = _butter(order, cutoff / nyq, "highpass")
             yf = sg.filtfilt(b, a, signal, axis=ax)
 
         return yf
@@ -265,7 +275,7 @@ class filter_sig:
     def lowpass(signal, cutoff, fs=1250, order=6, ax=-1):
         nyq = 0.5 * fs
 
-        b, a = sg.butter(order, cutoff / nyq, btype="lowpass")
+        b, a = _butter(order, cutoff / nyq, "lowpass")
         yf = sg.filtfilt(b, a, signal, axis=ax)
 
         return yf
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from neuropy.core import Epoch
+
+
+def _point_process_loop(epochs, t_start, t_stop, bin_size):
+    # reference: one slice assignment per epoch
+    times = np.arange(t_start, t_stop, bin_size)
+    time_bool = np.zeros_like(times).astype(bool)
+    for start_ind, end_ind in zip(
+        ((epochs.starts - t_start) / bin_size).astype(int), ((epochs.stops - t_start) / bin_size).astype(int)
+    ):
+        time_bool[start_ind:end_ind] = True
+    return times, time_bool
+
+
+def test_to_point_process_matches_loop():
+    cases = [
+        ([1.0, 4, 7], [2.0, 5, 9]),  # disjoint
+        ([1.0, 1.5, 3], [2.0, 4, 3.5]),  # overlapping and nested
+        ([-3.0, -0.5, 2], [-1.0, 1, 2]),  # negative starts and stops, zero length epoch
+        ([8.0, 9.5, 12], [15.0, 20, 13]),  # stops and starts past t_stop
+        ([5.0, 2], [4.0, 1]),  # stop before start
+    ]
+    for starts, stops in cases:
+        epochs = Epoch.from_array(starts, stops)
+        for t_start, t_stop in [(0, 10), (0.5, 9.7), (-2, 6)]:
+            times, time_bool = epochs.to_point_process(t_start, t_stop, bin_size=0.1)
+            expected_times, expected = _point_process_loop(epochs, t_start, t_stop, 0.1)
+            assert np.array_equal(times, expected_times)
+            assert np.array_equal(time_bool, expected)
+
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        starts = rng.uniform(-5, 15, 20)
+        epochs = Epoch.from_array(starts, starts + rng.uniform(-1, 3, 20))
+        time_bool = epochs.to_point_process(0, 10, bin_size=0.05)[1]
+        assert np.array_equal(time_bool, _point_process_loop(epochs, 0, 10, 0.05)[1])
+
+
+def test_to_point_process_no_epochs():
+    epochs = Epoch(epochs=pd.DataFrame({"start": [], "stop": [], "label": []}))
+    times, time_bool = epochs.to_point_process(0, 10, bin_size=0.1)
+    assert len(times) == len(time_bool) and not np.any(time_bool)
+
+
+def test_get_indices_for_time_matches_loop():
+    def indices_loop(epochs, t):
+        time_bool = np.zeros_like(t)
+        for e in epochs.as_array():
+            time_bool[np.where((t >= e[0]) & (t <= e[1]))[0]] = 1
+        return time_bool.astype("bool")
+
+    t = np.concatenate((np.arange(0, 10, 0.01), [1, 2, 3, 3.5, 6, 8, 9, 9.5]))
+    cases = [
+        ([1.0, 3, 6], [2.0, 3.5, 8]),  # sorted and disjoint, t on every start and stop
+        ([1.0, 1.5, 2], [3.0, 2, 2]),  # overlapping, nested and zero length
+        ([6.0, 1, 3], [8.0, 2, 3.5]),  # unsorted
+        ([8.0, 2, 1], [9.5, 6, 9]),  # unsorted and overlapping
+        ([1.0, 5], [10.0, 4]),  # stop before start inside another epoch
+        ([5.0, 3, 6], [4.0, 3.5, 2]),  # stops before starts only
+    ]
+    for starts, stops in cases:
+        epochs = Epoch.from_array(starts, stops)
+        assert np.array_equal(epochs.get_indices_for_time(t), indices_loop(epochs, t))
+
+    epochs = Epoch.from_array([1.0, 3], [2.0, 3.5])
+    assert np.array_equal(
+        epochs.get_indices_for_time(np.array([1, 2, 3, 3.5, 0.999, 2.001])),
+        [True, True, True, True, False, False],
+    )
@@ -18,3 +18,126 @@ def test_pf():
 
     neurons = Neurons(spiketrains=spktrns, t_start=0, t_stop=2000)
     pf1d = Pf1D(neurons=neurons, position=pos, speed_thresh=0.1, grid_bin=5)
+
+
+def test_histogram_helpers_match_numpy(monkeypatch):
+    from neuropy.analyses import placefields
+    from neuropy.analyses.placefields import _BinGeometry, _histogram1d, _histogram2d_func
+
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(0, 10, 1000), rng.uniform(-5, 5, 1000)
+    x[:3] = [0, 10, 5]  # values on first, last and inner edges
+    xbin, ybin = np.arange(0, 12, 2), np.arange(-5, 6, 1)
+
+    assert np.array_equal(_histogram1d(x, xbin), np.histogram(x, bins=xbin)[0])
+    idx = _BinGeometry.from_edges(xbin).bin_indices(x)
+    assert np.array_equal(
+        np.bincount(idx[idx >= 0], minlength=len(xbin) - 1), np.histogram(x, bins=xbin)[0]
+    )
+    assert np.array_equal(
+        _histogram2d_func(xbin, ybin)(x, y), np.histogram2d(x, y, bins=(xbin, ybin))[0]
+    )
+
+    # numpy only fallback
+    monkeypatch.setattr(placefields, "fast_histogram", None)
+    assert np.array_equal(
+        _histogram2d_func(xbin, ybin)(x, y), np.histogram2d(x, y, bins=(xbin, ybin))[0]
+    )
+
+
+def test_histogram_helpers_keep_samples_on_data_edges(monkeypatch):
+    # edges built from the data like Pf1D/Pf2D, so the min and max samples sit on the outer edges
+    from neuropy.analyses import placefields
+    from neuropy.analyses.placefields import _histogram1d, _histogram2d_func
+
+    rng = np.random.default_rng(1)
+    for fast_histogram in (placefields.fast_histogram, None):
+        monkeypatch.setattr(placefields, "fast_histogram", fast_histogram)
+        for _ in range(50):
+            x, y = rng.normal(0, 37.3, 500), rng.uniform(-13.7, 91.1, 500)
+            xbin = np.arange(np.nanmin(x), np.nanmax(x) + 2.5, 2.5)
+            ybin = np.arange(np.nanmin(y), np.nanmax(y) + 1.7, 1.7)
+
+            counts1d = _histogram1d(x, xbin)
+            counts2d = _histogram2d_func(xbin, ybin)(x, y)
+            assert counts1d.sum() == len(x) and counts2d.sum() == len(x)
+            assert np.array_equal(counts1d, np.histogram(x, bins=xbin)[0])
+            assert np.array_equal(counts2d, np.histogram2d(x, y, bins=(xbin, ybin))[0])
+
+
+def test_interp_uniform_matches_numpy():
+    from neuropy.analyses.placefields import _interp_uniform
+
+    rng = np.random.default_rng(0)
+    t = np.arange(500) * (1 / 30) + 2.5
+    x, y = rng.uniform(0, 100, 500), rng.uniform(0, 100, 500)
+    tq = np.concatenate((rng.uniform(t[0], t[-1], 1000), [t[0], t[-1], t[10], 0, 100]))
+
+    for fp, interp in zip((x, y), _interp_uniform(tq, t[0], 30, x, y)):
+        assert np.allclose(interp, np.interp(tq, t, fp))
+
+
+def test_where_in_epochs_matches_loop():
+    from neuropy.analyses.placefields import _where_in_epochs
+
+    rng = np.random.default_rng(0)
+    t = rng.uniform(0, 100, 2000)
+    t[:2] = [10, 20]  # on epoch edges
+    for starts, stops in [
+        (np.array([10.0, 30, 60]), np.array([20.0, 50, 61])),  # disjoint
+        (np.array([10.0, 20, 40]), np.array([20.0, 45, 50])),  # touching and overlapping
+    ]:
+        expected = np.concatenate(
+            [np.where((t >= start) & (t <= stop))[0] for start, stop in zip(starts, stops)]
+        )
+        assert np.array_equal(_where_in_epochs(t, starts, stops), expected)
+
+
+def test_pf1d_pf2d_match_per_cell_histograms():
+    # sigma=0, so maps are spike counts over occupancy binned with np.interp + np.histogram per cell
+    from neuropy.core import Epoch
+    from neuropy.analyses import Pf2D
+
+    rng = np.random.default_rng(0)
+    srate = 60
+    t = np.arange(60 * 120) / srate
+    x = np.sin(2 * np.pi * t / 20) * 100 + rng.normal(0, 1, len(t))
+    y = np.cos(2 * np.pi * t / 27) * 50 + rng.normal(0, 1, len(t))
+    spiketrains = [np.sort(rng.uniform(0, t[-1], 2000)) for _ in range(4)]
+    neurons = Neurons(spiketrains=np.array(spiketrains, dtype=object), t_start=0, t_stop=t[-1])
+
+    def rate(counts, occupancy):
+        return np.divide(counts, occupancy, out=np.zeros_like(occupancy), where=occupancy > 0)
+
+    # Pf1D, speed threshold or epochs
+    pos = Position(traces=x.reshape(1, -1), t_start=0, sampling_rate=srate)
+    speed, xbin = pos.speed, np.arange(np.nanmin(x), np.nanmax(x) + 5, 5)
+    epochs = Epoch.from_array([5.0, 30, 70.5], [20.0, 55, 100])
+    in_epochs = lambda tt: np.any([(tt >= e[0]) & (tt <= e[1]) for e in epochs.as_array()], axis=0)
+    for ep in (None, epochs):
+        pf = Pf1D(neurons, pos, epochs=ep, frate_thresh=0, speed_thresh=3, grid_bin=5, sigma=0, sigma_pos=0)
+        running = in_epochs(t) if ep is not None else speed >= 3
+        occupancy = np.histogram(x[running], bins=xbin)[0] / srate
+        for spk, tuning_curve in zip(spiketrains, pf.tuning_curves):
+            spk = spk[in_epochs(spk)] if ep is not None else spk[np.interp(spk, t, speed) >= 3]
+            counts = np.histogram(np.interp(spk, t, x), bins=xbin)[0]
+            assert np.allclose(tuning_curve, rate(counts, occupancy), rtol=1e-10, atol=1e-12)
+        assert np.allclose(pf.occupancy, occupancy)
+
+    # Pf2D, position on the x and z traces
+    pos = Position(traces=np.vstack((x, np.zeros_like(x), y)), t_start=0, sampling_rate=srate)
+    pf = Pf2D(neurons, pos, frate_thresh=0, speed_thresh=3, grid_bin=5, sigma=0)
+    maze = (t > t[0]) & (t < t[-1])
+    xm, ym, tm = x[maze], y[maze], t[maze]
+    speed = np.sqrt(np.diff(xm) ** 2 + np.diff(ym) ** 2) * srate
+    running = np.where(speed / (tm[1] - tm[0]) > 3)[0]
+    xbin = np.arange(np.nanmin(xm), np.nanmax(xm) + 5, 5)
+    ybin = np.arange(np.nanmin(ym), np.nanmax(ym) + 5, 5)
+    occupancy = np.histogram2d(xm[running], ym[running], bins=(xbin, ybin))[0] / srate
+    assert np.allclose(pf.occupancy, occupancy)
+    assert len(pf.ratemaps) == len(spiketrains)
+    for spk, ratemap in zip(spiketrains, pf.ratemaps):
+        spk = spk[(spk > t[0]) & (spk < t[-1])]
+        spk = spk[np.interp(spk, tm[1:], speed) > 3]
+        counts = np.histogram2d(np.interp(spk, tm, xm), np.interp(spk, tm, ym), bins=(xbin, ybin))[0]
+        assert np.allclose(ratemap, rate(counts, occupancy), rtol=1e-10, atol=1e-12)